@@ -1,309 +1,472 @@
 import re
 import os
+import ctypes
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
 import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
-import docx
+from lxml import etree
 import markdown
+import numpy as np
 from markdown.extensions import codehilite
-import pdfplumber
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+
+_RE_COLOR = re.compile(r'color:\s*([^;]+)')
+_RE_FW_BOLD = re.compile(r'font-weight:\s*bold')
+_RE_FS_ITALIC = re.compile(r'font-style:\s*italic')
+_RE_TD_UL = re.compile(r'text-decoration:\s*underline')
+
+# RTF tokens: control word (+ optional numeric parameter), hex escape,
+# control symbol, group brace, or a run of literal text
+_RE_RTF = re.compile(rb"\\([a-z]+)(-?\d+)?\s?|\\'([0-9a-fA-F]{2})|\\(.)|([{}])|([^\\{}]+)", re.S)
+
+# Style flag bits
+BOLD = 1
+ITALIC = 2
+UNDERLINE = 4
+
+# Display text for every combination of the flag bits above
+_ATTR_NAMES = ('BOLD', 'ITALIC', 'UNDERLINED')
+_STYLE_STR = tuple(' | '.join(n for i, n in enumerate(_ATTR_NAMES) if mask & (1 << i)) for mask in range(8))
+
+_RTF_FLAGS = {b'b': BOLD, b'i': ITALIC, b'ul': UNDERLINE}
+# Underline style variants (dotted, double, word, wave, ...) also turn underline on
+_RTF_FLAGS.update(dict.fromkeys((
+    b'uld', b'uldash', b'uldashd', b'uldashdd', b'uldb', b'ulhwave', b'ulldash',
+    b'ulth', b'ulthd', b'ulthdash', b'ulthdashd', b'ulthdashdd', b'ulthldash',
+    b'ululdbwave', b'ulw', b'ulwave'
+), UNDERLINE))
+
+_BOLD_TAGS = frozenset({'b', 'strong'})
+_ITALIC_TAGS = frozenset({'i', 'em'})
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_NS = {'w': _W[1:-1]}
+_W_VAL = _W + 'val'
+_DOCX_OFF = ('0', 'false', 'off')
+
+# Number of parsed documents StyleChecker keeps around for repeat searches
+_CACHE_SIZE = 8
+
+# Below this many pages, worker start-up costs more than it saves
+_PDF_PARALLEL_MIN_PAGES = 8
+
+
+@dataclass
+class RleStyles:
+    """Run-length encoded styles: run i covers text[starts[i]:starts[i + 1]]."""
+    text: str
+    starts: np.ndarray  # int32 offset where each run begins
+    flags: np.ndarray  # uint8 bitmask of BOLD/ITALIC/UNDERLINE
+    colors: list
+    sizes: np.ndarray  # uint16, 0 when the format has no size info
+    
+    def __len__(self):
+        return len(self.text)
+
+
+class _StyleBuffer:
+    """Collects text runs and their styles while a parser walks a document."""
+    
+    def __init__(self):
+        self.text_parts = []
+        self.run_starts = []
+        self.run_flags = []
+        self.run_colors = []
+        self.run_sizes = []
+        self._length = 0
+        self._last_style = None
+    
+    def add(self, chunk, flags=0, color='black', font_size=0):
+        if not chunk:
+            return
+        
+        # Adjacent chunks with the same style extend the current run
+        style = (flags, color, font_size)
+        if style != self._last_style:
+            self.run_starts.append(self._length)
+            self.run_flags.append(flags)
+            self.run_colors.append(color)
+            self.run_sizes.append(font_size)
+            self._last_style = style
+        
+        self.text_parts.append(chunk)
+        self._length += len(chunk)
+    
+    def build(self):
+        text = ''.join(self.text_parts)
+        return text, RleStyles(
+            text,
+            np.asarray(self.run_starts, dtype=np.int32),
+            np.asarray(self.run_flags, dtype=np.uint8),
+            self.run_colors,
+            np.asarray(self.run_sizes, dtype=np.uint16)
+        )
+
+
+def _extract_page_chars(filepath, page_index):
+    """Worker entry point: open the PDF and return the runs of one page."""
+    pdf = pdfium.PdfDocument(filepath)
+    try:
+        return _page_runs(pdf, page_index)
+    finally:
+        pdf.close()
+
+
+def _page_runs(pdf, page_index):
+    """Return one page of an open PDF as a list of (text, flags, font_size) runs."""
+    runs = []
+    run_chars = []
+    run_style = None
+    # Font names repeat across long runs, so resolve each one only once
+    font_cache = {}
+    name_buf = ctypes.create_string_buffer(256)
+    
+    textpage = pdf[page_index].get_textpage()
+    
+    for i in range(textpage.count_chars()):
+        # One C call per index keeps text and font lookups on the same glyph;
+        # get_text_range() may drop or insert characters relative to indices
+        char = chr(pdfium_c.FPDFText_GetUnicode(textpage.raw, i))
+        # PDFium reports line breaks as '\r\n'; keep the '\n'
+        if not (char.strip() or char in ' \n'):
+            continue
+        
+        # Extract formatting info
+        needed = pdfium_c.FPDFText_GetFontInfo(textpage.raw, i, name_buf, len(name_buf), None)
+        if needed == 0:
+            # Spaces and line breaks PDFium generates itself have no font;
+            # name_buf still holds the previous glyph's name, so don't use it
+            char_style = (0, 12)
+        else:
+            if needed > len(name_buf):
+                name_buf = ctypes.create_string_buffer(needed)
+                pdfium_c.FPDFText_GetFontInfo(textpage.raw, i, name_buf, needed, None)
+            raw_font = name_buf.value
+            font_size = pdfium_c.FPDFText_GetFontSize(textpage.raw, i)
+            
+            # Detect styling from font name
+            flags = font_cache.get(raw_font)
+            if flags is None:
+                font_name = raw_font.lower()
+                is_bold = b'bold' in font_name or b'black' in font_name
+                is_italic = b'italic' in font_name or b'oblique' in font_name
+                # Underline is hard to detect in PDF
+                flags = (BOLD if is_bold else 0) | (ITALIC if is_italic else 0)
+                font_cache[raw_font] = flags
+            char_style = (flags, round(font_size))
+        
+        if char_style != run_style:
+            if run_chars:
+                runs.append((''.join(run_chars), *run_style))
+            run_chars = []
+            run_style = char_style
+        run_chars.append(char)
+    
+    if run_chars:
+        runs.append((''.join(run_chars), *run_style))
+    
+    return runs
 
 
 class StyleChecker:
     def __init__(self):
         self.formats = ['.html', '.htm', '.docx', '.rtf', '.md', '.pdf']
+        # Reused across files; reset() clears per-document state
+        self._md = markdown.Markdown(extensions=['extra'])
+        # Parsed documents keyed by (path, mtime, size), oldest first
+        self._cache = OrderedDict()
         
     def load_file(self, filepath):
         p = Path(filepath)
         ext = p.suffix.lower()
         
         if ext in ['.html', '.htm']:
-            return self._parse_html(filepath)
+            parser = self._parse_html
         elif ext == '.docx':
-            return self._parse_docx(filepath)
+            parser = self._parse_docx
         elif ext == '.rtf':
-            return self._parse_rtf(filepath)
+            parser = self._parse_rtf
         elif ext == '.md':
-            return self._parse_markdown(filepath)
+            parser = self._parse_markdown
         elif ext == '.pdf':
-            return self._parse_pdf(filepath)
+            parser = self._parse_pdf
         else:
             raise Exception(f"Don't support {ext} files")
+        
+        st = os.stat(filepath)
+        key = (os.path.abspath(filepath), st.st_mtime_ns, st.st_size)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        
+        text, styles = parser(filepath)
+        # Lowercased once here so repeated searches don't re-copy the text.
+        # Only ASCII text keeps its positions when lowercased (see find_text)
+        result = (text, styles, text.lower() if text.isascii() else None)
+        
+        self._cache[key] = result
+        if len(self._cache) > _CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
     
     def _parse_html(self, filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        soup = BeautifulSoup(content, 'html.parser')
-        text_data = ""
-        char_styles = []
-        
-        def extract_from_element(elem, styles=None):
-            if styles is None:
-                styles = {'bold': False, 'italic': False, 'underline': False, 'color': 'black'}
+        # Hand the raw bytes to the parser and let it decode them in one go
+        soup = BeautifulSoup(Path(filepath).read_bytes(), 'lxml', from_encoding='utf-8')
+        buf = _StyleBuffer()
+        
+        # Walk the tree with an explicit stack of (node, inherited flags, inherited color)
+        stack = [(soup.find('body') or soup, 0, 'black')]
+        while stack:
+            elem, flags, color = stack.pop()
             
-            current_style = styles.copy()
+            if not hasattr(elem, 'children'):
+                text_content = ''.join(c for c in str(elem) if c.strip() or c == ' ')
+                buf.add(text_content, flags, color)
+                continue
             
-            if elem.name in ['b', 'strong']:
-                current_style['bold'] = True
-            if elem.name in ['i', 'em']:
-                current_style['italic'] = True
+            if elem.name in _BOLD_TAGS:
+                flags |= BOLD
+            if elem.name in _ITALIC_TAGS:
+                flags |= ITALIC
             if elem.name == 'u':
-                current_style['underline'] = True
+                flags |= UNDERLINE
                 
-            if hasattr(elem, 'attrs') and 'style' in elem.attrs:
-                style_str = elem.attrs['style']
-                if 'font-weight:bold' in style_str or 'font-weight: bold' in style_str:
-                    current_style['bold'] = True
-                if 'font-style:italic' in style_str:
-                    current_style['italic'] = True
-                if 'text-decoration:underline' in style_str:
-                    current_style['underline'] = True
+            style_str = elem.attrs.get('style')
+            if style_str:
+                if _RE_FW_BOLD.search(style_str):
+                    flags |= BOLD
+                if _RE_FS_ITALIC.search(style_str):
+                    flags |= ITALIC
+                if _RE_TD_UL.search(style_str):
+                    flags |= UNDERLINE
                     
-                color_match = re.search(r'color:\s*([^;]+)', style_str)
+                color_match = _RE_COLOR.search(style_str)
                 if color_match:
-                    current_style['color'] = color_match.group(1).strip()
+                    color = color_match.group(1).strip()
             
-            for child in elem.children:
-                if hasattr(child, 'children'):
-                    extract_from_element(child, current_style)
-                else:
-                    text_content = str(child)
-                    for c in text_content:
-                        if c.strip() or c == ' ':
-                            nonlocal text_data, char_styles
-                            text_data += c
-                            char_styles.append({
-                                'char': c,
-                                **current_style
-                            })
-        
-        body = soup.find('body') or soup
-        extract_from_element(body)
-        return text_data, char_styles
+            # Reversed so children are popped in document order
+            stack.extend((child, flags, color) for child in reversed(elem.contents))
+        
+        return buf.build()
     
     def _parse_docx(self, filepath):
-        doc = docx.Document(filepath)
-        full_text = ""
-        styles_list = []
-        
-        for para in doc.paragraphs:
-            for r in para.runs:
-                text_chunk = r.text
-                for ch in text_chunk:
-                    full_text += ch
-                    
-                    color_val = 'black'
-                    if r.font.color and r.font.color.rgb:
-                        rgb = r.font.color.rgb
-                        color_val = f"rgb({rgb.red},{rgb.green},{rgb.blue})"
+        with zipfile.ZipFile(filepath) as zf:
+            root = etree.fromstring(zf.read('word/document.xml'))
+        buf = _StyleBuffer()
+        # Most runs share a handful of colors, so format each one only once
+        color_cache = {None: 'black', 'auto': 'black'}
+        
+        for para in root.iterfind('w:body/w:p', _W_NS):
+            for r in para.iterfind('w:r', _W_NS):
+                parts = []
+                for child in r:
+                    if child.tag == _W + 't':
+                        parts.append(child.text or '')
+                    elif child.tag in (_W + 'tab', _W + 'ptab'):
+                        parts.append('\t')
+                    elif child.tag == _W + 'noBreakHyphen':
+                        parts.append('-')
+                    elif child.tag == _W + 'cr':
+                        parts.append('\n')
+                    elif child.tag == _W + 'br':
+                        # Page and column breaks carry no text
+                        if child.get(_W + 'type', 'textWrapping') == 'textWrapping':
+                            parts.append('\n')
+                
+                flags = 0
+                hex_val = None
+                rpr = r.find('w:rPr', _W_NS)
+                if rpr is not None:
+                    b = rpr.find('w:b', _W_NS)
+                    if b is not None and b.get(_W_VAL) not in _DOCX_OFF:
+                        flags |= BOLD
+                    i = rpr.find('w:i', _W_NS)
+                    if i is not None and i.get(_W_VAL) not in _DOCX_OFF:
+                        flags |= ITALIC
+                    u = rpr.find('w:u', _W_NS)
+                    if u is not None and u.get(_W_VAL) not in (None, 'none') + _DOCX_OFF:
+                        flags |= UNDERLINE
                     
-                    styles_list.append({
-                        'char': ch,
-                        'bold': bool(r.bold),
-                        'italic': bool(r.italic),
-                        'underline': bool(r.underline),
-                        'color': color_val
-                    })
+                    color = rpr.find('w:color', _W_NS)
+                    if color is not None:
+                        hex_val = color.get(_W_VAL)
+                
+                color_val = color_cache.get(hex_val)
+                if color_val is None:
+                    color_val = f"rgb({int(hex_val[0:2], 16)},{int(hex_val[2:4], 16)},{int(hex_val[4:6], 16)})"
+                    if color_val == 'rgb(0,0,0)':
+                        color_val = 'black'
+                    color_cache[hex_val] = color_val
+                
+                buf.add(''.join(parts), flags, color_val)
             
-            full_text += '\n'
-            styles_list.append({
-                'char': '\n',
-                'bold': False,
-                'italic': False,
-                'underline': False,
-                'color': 'black'
-            })
-        
-        return full_text, styles_list
+            buf.add('\n')
+        
+        return buf.build()
     
     def _parse_rtf(self, filepath):
-        with open(filepath, 'rb') as f:
-            raw_data = f.read()
+        raw_data = Path(filepath).read_bytes()
         
-        try:
-            content = raw_data.decode('utf-8')
-        except:
-            content = raw_data.decode('latin-1', errors='ignore')
-        
-        # Better RTF parsing
-        text_parts = []
-        styles_parts = []
-        
-        # Track RTF state
-        bold_state = False
-        italic_state = False
-        underline_state = False
-        
-        # Simple RTF parser
-        i = 0
-        while i < len(content):
-            if content[i] == '\\':
-                # Found RTF control
-                i += 1
-                if i < len(content):
-                    if content[i:i+1] == 'b':
-                        # Bold control
-                        if i+1 < len(content) and content[i+1] in '0 ':
-                            bold_state = False
-                        else:
-                            bold_state = True
-                        # Skip past control
-                        while i < len(content) and content[i] not in ' \n':
-                            i += 1
-                    elif content[i:i+1] == 'i':
-                        # Italic control
-                        if i+1 < len(content) and content[i+1] in '0 ':
-                            italic_state = False
-                        else:
-                            italic_state = True
-                        while i < len(content) and content[i] not in ' \n':
-                            i += 1
-                    elif content[i:i+2] == 'ul':
-                        # Underline control
-                        if i+2 < len(content) and content[i+2] in '0 ':
-                            underline_state = False
-                        else:
-                            underline_state = True
-                        while i < len(content) and content[i] not in ' \n':
-                            i += 1
-                    else:
-                        # Skip other controls
-                        while i < len(content) and content[i] not in ' \n':
-                            i += 1
-            elif content[i] in '{}':
-                # Skip braces
-                pass
-            elif content[i].isprintable() or content[i].isspace():
-                # Regular text
-                text_parts.append(content[i])
-                styles_parts.append({
-                    'char': content[i],
-                    'bold': bold_state,
-                    'italic': italic_state,
-                    'underline': underline_state,
-                    'color': 'black'
-                })
-            i += 1
-        
-        return ''.join(text_parts), styles_parts
+        buf = _StyleBuffer()
+        
+        # Track RTF state as a flag mask; braces save/restore it like RTF groups do
+        state = 0
+        group_stack = []
+        
+        for m in _RE_RTF.finditer(raw_data):
+            word, param, hex_code, symbol, brace, literal = m.groups()
+            
+            if literal is not None:
+                try:
+                    chunk = literal.decode('utf-8')
+                except UnicodeDecodeError:
+                    chunk = literal.decode('latin-1')
+            elif word is not None:
+                flag = _RTF_FLAGS.get(word)
+                if flag is not None:
+                    state = state & ~flag if param == b'0' else state | flag
+                elif word == b'ulnone':
+                    state &= ~UNDERLINE
+                elif word == b'plain':
+                    state = 0
+                continue
+            elif hex_code is not None:
+                chunk = bytes([int(hex_code, 16)]).decode('latin-1')
+            elif symbol is not None:
+                if symbol not in b'\\{}':
+                    continue
+                chunk = symbol.decode('latin-1')
+            elif brace == b'{':
+                group_stack.append(state)
+                continue
+            else:
+                if group_stack:
+                    state = group_stack.pop()
+                continue
+            
+            buf.add(chunk, state)
+        
+        return buf.build()
     
     def _parse_pdf(self, filepath):
-        text_content = ""
-        char_styles = []
+        buf = _StyleBuffer()
         
         try:
-            with pdfplumber.open(filepath) as pdf:
-                for page in pdf.pages:
-                    # Extract text with character-level info
-                    chars = page.chars
-                    
-                    for char_info in chars:
-                        char = char_info.get('text', '')
-                        if char.strip() or char == ' ':
-                            text_content += char
-                            
-                            # Extract formatting info
-                            font_name = char_info.get('fontname', '').lower()
-                            font_size = char_info.get('size', 12)
-                            
-                            # Detect styling from font name
-                            is_bold = 'bold' in font_name or 'black' in font_name
-                            is_italic = 'italic' in font_name or 'oblique' in font_name
-                            
-                            char_styles.append({
-                                'char': char,
-                                'bold': is_bold,
-                                'italic': is_italic,
-                                'underline': False,  # Hard to detect in PDF
-                                'color': 'black',
-                                'font_size': font_size
-                            })
-                    
-                    # Add page break
-                    if len(pdf.pages) > 1:
-                        text_content += '\n'
-                        char_styles.append({
-                            'char': '\n',
-                            'bold': False,
-                            'italic': False,
-                            'underline': False,
-                            'color': 'black',
-                            'font_size': 12
-                        })
+            pdf = pdfium.PdfDocument(filepath)
+            try:
+                n_pages = len(pdf)
+                # Small documents are read from this one open document
+                if n_pages < _PDF_PARALLEL_MIN_PAGES:
+                    pages = [_page_runs(pdf, i) for i in range(n_pages)]
+            finally:
+                pdf.close()
+            
+            # Pages are independent, so large documents are split across processes
+            # which each open the file themselves
+            if n_pages >= _PDF_PARALLEL_MIN_PAGES:
+                with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, n_pages)) as ex:
+                    pages = list(ex.map(_extract_page_chars, repeat(filepath), range(n_pages)))
+            
+            # Pages of multi-page documents are separated by a plain newline run
+            page_break = ('\n', 0, 'black', 12) if n_pages > 1 else None
+            
+            for runs in pages:
+                for text, flags, font_size in runs:
+                    buf.add(text, flags, font_size=font_size)
+                
+                if page_break:
+                    buf.add(*page_break)
         
         except Exception as e:
-            print(f"PDF parsing error: {e}")
-            return "", []
+            # Raise rather than return an empty result so load_file doesn't cache it
+            raise Exception(f"PDF parsing error: {e}") from e
         
-        return text_content, char_styles
+        return buf.build()
     
     def _parse_markdown(self, filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            md_content = f.read()
+        md_content = Path(filepath).read_bytes().decode('utf-8')
         
-        md = markdown.Markdown(extensions=['extra'])
-        html_content = md.convert(md_content)
+        self._md.reset()
+        html_content = self._md.convert(md_content)
         
         html_doc = f"<html><body>{html_content}</body></html>"
         
-        soup = BeautifulSoup(html_doc, 'html.parser')
-        text_result = ""
-        style_result = []
+        soup = BeautifulSoup(html_doc, 'lxml')
+        buf = _StyleBuffer()
         
-        def process_md_element(elem, inherited=None):
-            if inherited is None:
-                inherited = {'bold': False, 'italic': False, 'underline': False, 'color': 'black'}
+        stack = [(soup.body, 0, 'black')]
+        while stack:
+            elem, flags, color = stack.pop()
             
-            styles = inherited.copy()
+            if not hasattr(elem, 'children'):
+                buf.add(str(elem), flags, color)
+                continue
             
-            if elem.name in ['strong', 'b']:
-                styles['bold'] = True
-            elif elem.name in ['em', 'i']:
-                styles['italic'] = True
+            if elem.name in _BOLD_TAGS:
+                flags |= BOLD
+            elif elem.name in _ITALIC_TAGS:
+                flags |= ITALIC
             elif elem.name == 'code':
-                styles['color'] = 'red'
-            elif elem.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                styles['bold'] = True
-                styles['color'] = 'blue'
+                color = 'red'
+            elif elem.name in _HEADING_TAGS:
+                flags |= BOLD
+                color = 'blue'
             
-            for child in elem.children:
-                if hasattr(child, 'children'):
-                    process_md_element(child, styles)
-                else:
-                    content = str(child)
-                    for c in content:
-                        nonlocal text_result, style_result
-                        text_result += c
-                        style_result.append({
-                            'char': c,
-                            **styles
-                        })
-        
-        process_md_element(soup.body)
-        return text_result, style_result
+            stack.extend((child, flags, color) for child in reversed(elem.contents))
+        
+        return buf.build()
     
-    def find_text(self, haystack, needle):
-        lower_hay = haystack.lower()
+    def find_text(self, haystack, needle, lower_hay=None):
         lower_needle = needle.lower()
         
-        pos = lower_hay.find(lower_needle)
-        if pos >= 0:
-            return pos, pos + len(needle) - 1
-        
-        words = needle.lower().split()
+        if haystack.isascii():
+            # str.find on the lowered copy is C-level fast search
+            if lower_hay is None:
+                lower_hay = haystack.lower()
+            pos = lower_hay.find(lower_needle)
+            if pos >= 0:
+                return pos, pos + len(needle) - 1
+            target, flags = lower_hay, re.DOTALL
+        else:
+            # Lowercasing can change the length of non-ASCII text (e.g. 'İ'),
+            # so match case-insensitively on the original to keep positions
+            match = re.search(re.escape(needle), haystack, re.IGNORECASE)
+            if match:
+                return match.start(), match.end() - 1
+            target, flags = haystack, re.DOTALL | re.IGNORECASE
+        
+        # Fall back to the span from the first word to the last word after it
+        words = lower_needle.split()
         if len(words) > 1:
-            first_word_pos = lower_hay.find(words[0])
-            if first_word_pos >= 0:
-                last_word_pos = lower_hay.find(words[-1], first_word_pos)
-                if last_word_pos >= 0:
-                    return first_word_pos, last_word_pos + len(words[-1]) - 1
+            pattern = re.compile(re.escape(words[0]) + '.*?' + re.escape(words[-1]), flags)
+            match = pattern.search(target)
+            if match:
+                return match.start(), match.end() - 1
         
         return None, None
     
     def get_style_at(self, styles, pos):
         if 0 <= pos < len(styles):
-            return styles[pos]
+            idx = int(np.searchsorted(styles.starts, pos, side='right')) - 1
+            mask = int(styles.flags[idx])
+            return {
+                'char': styles.text[pos],
+                'flags': mask,
+                'bold': bool(mask & BOLD),
+                'italic': bool(mask & ITALIC),
+                'underline': bool(mask & UNDERLINE),
+                'color': styles.colors[idx],
+                'font_size': int(styles.sizes[idx]) or None
+            }
         return None
     
     def style_to_string(self, style_data):
@@ -311,27 +474,23 @@ class StyleChecker:
             return "Not found"
         
         char = repr(style_data['char'])
-        attrs = []
-        
-        if style_data.get('bold'):
-            attrs.append('BOLD')
-        if style_data.get('italic'):
-            attrs.append('ITALIC')
-        if style_data.get('underline'):
-            attrs.append('UNDERLINED')
+        mask = style_data.get('flags')
+        if mask is None:
+            # Plain style dicts only carry the boolean keys
+            mask = ((BOLD if style_data.get('bold') else 0)
+                    | (ITALIC if style_data.get('italic') else 0)
+                    | (UNDERLINE if style_data.get('underline') else 0))
+        desc = _STYLE_STR[mask]
         
         color = style_data.get('color', 'black')
         if color != 'black':
-            attrs.append(f'COLOR:{color}')
+            desc = f"{desc} | COLOR:{color}" if desc else f"COLOR:{color}"
         
         font_size = style_data.get('font_size')
-        if font_size and font_size != 'normal':
-            attrs.append(f'SIZE:{font_size}')
-        
-        if not attrs:
-            attrs.append('NORMAL')
+        if font_size:
+            desc = f"{desc} | SIZE:{font_size}" if desc else f"SIZE:{font_size}"
         
-        return f"{char} -> {' | '.join(attrs)}"
+        return f"{char} -> {desc or 'NORMAL'}"
     
     def check_message(self, file_path, search_text):
         if not os.path.exists(file_path):
@@ -339,7 +498,7 @@ class StyleChecker:
             return
         
         try:
-            text, styles = self.load_file(file_path)
+            text, styles, text_lower = self.load_file(file_path)
         except Exception as e:
             print(f"Failed to read file: {e}")
             return
@@ -347,7 +506,7 @@ class StyleChecker:
         print(f"Loaded {len(text)} characters from file")
         print(f"Sample: {text[:50]}{'...' if len(text) > 50 else ''}")
         
-        start, end = self.find_text(text, search_text)
+        start, end = self.find_text(text, search_text, text_lower)
         if start is None:
             print(f"'{search_text}' not found in the text")
             return
@@ -372,6 +531,24 @@ class StyleChecker:
             'after_style': after_char,
             'context': context
         }
+    
+    def batch_check(self, paths, search_text):
+        # Start readahead for every file first so the kernel fetches them
+        # concurrently while earlier ones are being parsed
+        if hasattr(os, 'posix_fadvise'):
+            for path in paths:
+                try:
+                    fd = os.open(path, os.O_RDONLY)
+                except OSError:
+                    continue
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                except OSError:
+                    pass
+                finally:
+                    os.close(fd)
+        
+        return {path: self.check_message(path, search_text) for path in paths}
 
 
 